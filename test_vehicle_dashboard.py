@@ -0,0 +1,283 @@
+import contextlib
+import io
+import logging
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import vehicle_dashboard as vd
+
+
+def scalar_alert_kinds(state, thresholds):
+    # Which of speed / RPM / battery the single-vehicle path alerts on
+    return (
+        state.speed > thresholds.speed,
+        state.rpm > thresholds.rpm,
+        state.battery < thresholds.battery,
+    )
+
+
+class LoadThresholdsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config_file = vd.CONFIG_FILE
+        vd.CONFIG_FILE = os.path.join(self.tmp.name, "config.ini")
+
+    def tearDown(self):
+        vd.CONFIG_FILE = self.config_file
+        self.tmp.cleanup()
+
+    def load(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return vd.load_thresholds()
+
+    def test_reads_thresholds(self):
+        with open(vd.CONFIG_FILE, "w") as f:
+            f.write("[THRESHOLDS]\nSPEED_KM_HR = 120\nRPM = 4000\nBATTERY_LEVEL_PCT = 10")
+        self.assertEqual(self.load(), vd.Thresholds(120.0, 4000.0, 10.0))
+
+    def test_missing_file_falls_back_to_defaults(self):
+        self.assertIs(self.load(), vd.DEFAULT_THRESHOLDS)
+
+    def test_unreadable_file_falls_back_to_defaults(self):
+        os.mkdir(vd.CONFIG_FILE)
+        self.assertIs(self.load(), vd.DEFAULT_THRESHOLDS)
+
+    def test_undecodable_file_falls_back_to_defaults(self):
+        with open(vd.CONFIG_FILE, "wb") as f:
+            f.write(b"\xff\xfe[THRESHOLDS]")
+        self.assertIs(self.load(), vd.DEFAULT_THRESHOLDS)
+
+
+class CheckAlertsTest(unittest.TestCase):
+    def alerts(self, state, thresholds):
+        out = []
+        vd.make_alert_checker(thresholds)(state, out)
+        return out
+
+    def test_alert_messages(self):
+        state = vd.VehicleState(130, 4100, 9.5)
+        self.assertEqual(self.alerts(state, vd.Thresholds(120.0, 4000.0, 10.0)), [
+            "🛑 HIGH SPEED ALERT! Speed: 130 Km/hr (Threshold: 120.0)",
+            "⚠️ HIGH RPM ALERT! RPM: 4100 (Threshold: 4000.0)",
+            "🪫 LOW BATTERY ALERT! Battery: 9.5% (Threshold: 10.0%)",
+        ])
+        self.assertEqual(self.alerts(vd.VehicleState(120, 4000, 10.0), vd.Thresholds(120.0, 4000.0, 10.0)), [])
+
+    def test_equal_int_and_float_thresholds_keep_their_own_text(self):
+        state = vd.VehicleState(130, 0, 100.0)
+        self.assertEqual(self.alerts(state, vd.Thresholds(110, 6000, 10)),
+                         ["🛑 HIGH SPEED ALERT! Speed: 130 Km/hr (Threshold: 110)"])
+        self.assertEqual(self.alerts(state, vd.Thresholds(110.0, 6000.0, 10.0)),
+                         ["🛑 HIGH SPEED ALERT! Speed: 130 Km/hr (Threshold: 110.0)"])
+
+    def test_non_finite_thresholds(self):
+        state = vd.VehicleState(130, 4100, 9.5)
+        self.assertEqual(self.alerts(state, vd.Thresholds(float("inf"), float("nan"), float("-inf"))), [])
+        self.assertEqual(self.alerts(state, vd.Thresholds(float("-inf"), 6000, 10)),
+                         ["🛑 HIGH SPEED ALERT! Speed: 130 Km/hr (Threshold: -inf)",
+                          "🪫 LOW BATTERY ALERT! Battery: 9.5% (Threshold: 10%)"])
+
+    def test_huge_config_value_parses_to_inf_and_runs(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            config_file, vd.CONFIG_FILE = vd.CONFIG_FILE, os.path.join(tmp, "config.ini")
+            try:
+                with open(vd.CONFIG_FILE, "w") as f:
+                    f.write("[THRESHOLDS]\nSPEED_KM_HR = " + "9" * 400 + "\nRPM = 4000\nBATTERY_LEVEL_PCT = 10")
+                self.assertEqual(vd.load_thresholds().speed, float("inf"))
+                with mock.patch.object(vd, "_emit", lambda text: None), \
+                        mock.patch.object(vd.logger, "disabled", True), \
+                        contextlib.redirect_stdout(io.StringIO()):
+                    vd.run_monitoring_cycle(1, offline=True)
+            finally:
+                vd.CONFIG_FILE = config_file
+
+
+class OfflineRunTest(unittest.TestCase):
+    def run_cycles(self, offline, sleep):
+        frames = []
+        with mock.patch.object(vd, "_emit", frames.append), \
+                mock.patch.object(vd, "load_thresholds", lambda: vd.Thresholds(120.0, 4000.0, 10.0)), \
+                mock.patch.object(vd.time, "sleep", sleep), \
+                mock.patch.object(vd.logger, "disabled", True), \
+                contextlib.redirect_stdout(io.StringIO()):
+            vd.run_monitoring_cycle(target_cycles=100, offline=offline, seed=3)
+        return frames
+
+    def test_replays_a_live_run_with_the_same_seed_without_sleeping(self):
+        live = self.run_cycles(offline=False, sleep=lambda seconds: None)
+        offline = self.run_cycles(offline=True, sleep=mock.Mock(side_effect=AssertionError("offline run slept")))
+        self.assertEqual(offline, live)
+
+
+class RepeatSkipTest(unittest.TestCase):
+    def test_is_repeat_tolerances(self):
+        self.assertFalse(vd._is_repeat((0, 800, 5000), None))
+        self.assertTrue(vd._is_repeat((0, 800, 4999), (0, 800, 5000)))
+        self.assertFalse(vd._is_repeat((1, 800, 5000), (0, 800, 5000)))
+        self.assertFalse(vd._is_repeat((40, 1201, 5000), (40, 1200, 5000)))
+        self.assertFalse(vd._is_repeat((0, 800, 4998), (0, 800, 5000)))
+
+    def test_idle_vehicle_reports_only_heartbeats(self):
+        def idle(state, randint=None):
+            state.speed, state.rpm = 0, 800
+            state.battery = round(state.battery - 0.01, 2)
+            return state
+
+        frames = []
+        with mock.patch.object(vd, "get_real_time_data", idle), \
+                mock.patch.object(vd, "_emit", frames.append), \
+                mock.patch.object(vd, "load_thresholds", lambda: vd.Thresholds(120.0, 4000.0, 10.0)), \
+                mock.patch.object(vd.time, "sleep", lambda seconds: None), \
+                mock.patch.object(vd.logger, "disabled", True), \
+                contextlib.redirect_stdout(io.StringIO()):
+            vd.run_monitoring_cycle(target_cycles=45)
+
+        headers = [frame.split("\n")[1] for frame in frames if "CYCLE" in frame]
+        self.assertEqual(headers, [
+            "======== CYCLE 1/45 ========",
+            "======== CYCLE 21/45 ========",
+            "======== CYCLE 41/45 ========",
+        ])
+
+
+def ticked_fleet(n_vehicles, ticks, seed, executor=None, workers=vd.FLEET_WORKERS):
+    fleet = vd.Fleet(n_vehicles)
+    rng = random.Random(seed)
+    for _ in range(ticks):
+        fleet.tick(rng, executor, workers)
+    return fleet
+
+
+class FleetTickTest(unittest.TestCase):
+    def test_tick_matches_scalar_path(self):
+        n_vehicles, ticks = 7, 300
+        fleet = ticked_fleet(n_vehicles, ticks, seed=11)
+
+        rng = random.Random(11)
+        states = [vd.VehicleState() for _ in range(n_vehicles)]
+        for _ in range(ticks):
+            speed_changes = rng.choices(range(-15, 16), k=n_vehicles)
+            rpm_noises = rng.choices(range(-400, 401), k=n_vehicles)
+            for state, speed_change, rpm_noise in zip(states, speed_changes, rpm_noises):
+                vd.get_real_time_data(state, speed_change, rpm_noise)
+
+        for i, state in enumerate(states):
+            self.assertEqual(fleet.speeds[i], state.speed)
+            self.assertEqual(fleet.rpms[i], state.rpm)
+            self.assertEqual(fleet.battery_pct(i), state.battery)
+
+    def test_column_widths(self):
+        fleet = vd.Fleet(1)
+        self.assertEqual(fleet.speeds.itemsize, 4)
+        self.assertEqual(fleet.rpms.itemsize, 2)
+        self.assertEqual(fleet.batteries.itemsize, 2)
+
+    def test_speed_column_holds_speeds_past_16_bits(self):
+        fleet = vd.Fleet(1)
+        fleet.speeds[0] = 65535
+        fleet._tick_range(0, 1, [15], [0])
+        self.assertEqual(fleet.speeds[0], 65550)
+
+
+class FleetExecutorTest(unittest.TestCase):
+    def test_threaded_tick_and_check_match_serial(self):
+        thresholds = vd.Thresholds(150.0, 4000.0, 99.5)
+        serial = ticked_fleet(50, 40, seed=5)
+        expected = serial.check_alerts(thresholds)
+        for workers in (1, 3, 8, 64):
+            with ThreadPoolExecutor(4) as executor:
+                threaded = ticked_fleet(50, 40, seed=5, executor=executor, workers=workers)
+                self.assertEqual(threaded.speeds, serial.speeds)
+                self.assertEqual(threaded.rpms, serial.rpms)
+                self.assertEqual(threaded.batteries, serial.batteries)
+                self.assertEqual(threaded.check_alerts(thresholds, executor, workers), expected)
+
+    def test_empty_fleet(self):
+        fleet = vd.Fleet(0)
+        with ThreadPoolExecutor(2) as executor:
+            fleet.tick(random.Random(0), executor)
+            self.assertEqual(fleet.check_alerts(vd.DEFAULT_THRESHOLDS, executor), ([], [], []))
+
+    def test_rejects_process_pool(self):
+        fleet = vd.Fleet(4)
+        with ProcessPoolExecutor(1) as executor:
+            with self.assertRaises(TypeError):
+                fleet.tick(random.Random(0), executor)
+            with self.assertRaises(TypeError):
+                fleet.check_alerts(vd.DEFAULT_THRESHOLDS, executor)
+
+    def test_rejects_fewer_than_one_worker(self):
+        fleet = vd.Fleet(4)
+        with ThreadPoolExecutor(1) as executor:
+            with self.assertRaises(ValueError):
+                fleet.tick(random.Random(0), executor, workers=0)
+            with self.assertRaises(ValueError):
+                fleet.check_alerts(vd.DEFAULT_THRESHOLDS, executor, workers=0)
+
+
+class FleetCheckAlertsTest(unittest.TestCase):
+    def test_matches_scalar_check(self):
+        fleet = ticked_fleet(200, 150, seed=3)
+        for thresholds in (vd.Thresholds(120.0, 4000.0, 98.5), vd.Thresholds(110, 6000, 10), vd.Thresholds(99.5, 3100.5, 98.55)):
+            speeding, over_rpm, low_battery = fleet.check_alerts(thresholds)
+            self.assertTrue(speeding or over_rpm or low_battery)
+            for i in range(len(fleet)):
+                state = vd.VehicleState(fleet.speeds[i], fleet.rpms[i], fleet.battery_pct(i))
+                self.assertEqual((i in speeding, i in over_rpm, i in low_battery), scalar_alert_kinds(state, thresholds))
+
+    def test_battery_thresholds_agree_with_scalar_check(self):
+        fleet = vd.Fleet(3)
+        for threshold_centi in range(0, 10001):
+            threshold = round(threshold_centi / 100, 2)
+            thresholds = vd.Thresholds(speed=1000, rpm=10000, battery=threshold)
+            fleet.batteries[0] = max(threshold_centi - 1, 0)
+            fleet.batteries[1] = threshold_centi
+            fleet.batteries[2] = min(threshold_centi + 1, 10000)
+
+            low_battery = fleet.check_alerts(thresholds)[2]
+            for i in range(3):
+                state = vd.VehicleState(fleet.speeds[i], fleet.rpms[i], fleet.battery_pct(i))
+                self.assertEqual(
+                    i in low_battery, scalar_alert_kinds(state, thresholds)[2],
+                    f"battery {fleet.battery_pct(i)} vs threshold {threshold}"
+                )
+
+
+class TelemetryTest(unittest.TestCase):
+    def setUp(self):
+        self.records = []
+        self.handler = logging.Handler()
+        self.handler.emit = lambda record: self.records.append(self.handler.format(record))
+        vd.logger.addHandler(self.handler)
+        vd.logger.propagate = False
+        vd.TELEMETRY.clear()
+
+    def tearDown(self):
+        vd.logger.removeHandler(self.handler)
+        vd.logger.propagate = True
+        vd.TELEMETRY.clear()
+
+    def test_flush_uses_handler_formatter(self):
+        self.handler.setFormatter(logging.Formatter("%(levelname)s|%(message)s"))
+        vd.log_data(vd.VehicleState(130, 4100, 9.5), ["alert one", "alert two"])
+        self.assertEqual(self.records, [])
+
+        vd.flush_telemetry()
+        self.assertEqual(self.records, [
+            "INFO|Speed: 130 Km/hr, RPM: 4100, Battery: 9.5%",
+            "WARNING|alert one\nalert two",
+        ])
+
+    def test_flush_respects_handler_level(self):
+        self.handler.setLevel(logging.ERROR)
+        vd.log_data(vd.VehicleState(130, 4100, 9.5), ["alert"])
+        vd.flush_telemetry()
+        self.assertEqual(self.records, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
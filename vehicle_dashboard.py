@@ -1,127 +1,421 @@
 import time
 import random
-import configparser
+import math
 import os
+import re
+import sys
 import logging
+from array import array
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional; without it the numeric kernels run as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
 
 # --- CONFIGURATION ---
 CONFIG_FILE = "config.ini"
 LOG_FILE = "dashboard.log"
 
+# Seconds between cycles: poll faster near a threshold, slower when far from all of them
+POLL_INTERVAL = 0.5
+FAST_POLL_INTERVAL = 0.1
+IDLE_POLL_INTERVAL = 1.0
+NEAR_MARGIN = 0.05
+IDLE_MARGIN = 0.5
+# A cycle is not displayed or logged when its whole speed and RPM match the
+# previous cycle, its battery moved by no more than one cycle's drain, and its
+# alerts match the last reported ones. Drain per cycle is 0.01 + RPM / 1500000,
+# i.e. 0.0105-0.0143% for RPM in 800-6500, which at the displayed 0.01%
+# resolution is always exactly one hundredth. A cycle is still reported at
+# least every HEARTBEAT_CYCLES so the output shows we're still alive.
+REPEAT_BATTERY_TOLERANCE = 1
+HEARTBEAT_CYCLES = 20
+
+# Parsed thresholds, keyed by (path, mtime_ns) so edits to the file are picked up
+_THRESHOLD_CACHE = {}
+# KEY = value lines; config.ini only carries numeric thresholds
+_KV = re.compile(r'^\s*([A-Z_]+)\s*=\s*([0-9.]+)\s*$', re.M)
+
+# --- SIMULATION ---
+# Private generator so the simulation doesn't go through the shared module-level one
+_rng = random.Random()
+# Battery drain per RPM per cycle, as a multiplier so the hot path avoids a division
+_DRAIN_PER_RPM = 1 / 1500000
+
+# --- DISPLAY ---
+# Every bar the dashboard can draw, indexed by fill level (RPM tops out at 6500)
+_BATTERY_BARS = tuple("█" * i + "░" * (10 - i) for i in range(11))
+_RPM_BARS = tuple("█" * i for i in range(8))
+# Loop output bypasses sys.stdout and goes to the stdout fd in one write per frame
+_STDOUT_FD = 1
+_ENC = "utf-8"
+# Alert messages, only formatted when the matching check fires
+_FMT_SPEED = "🛑 HIGH SPEED ALERT! Speed: %s Km/hr (Threshold: %s)"
+_FMT_RPM = "⚠️ HIGH RPM ALERT! RPM: %s (Threshold: %s)"
+_FMT_BATT = "🪫 LOW BATTERY ALERT! Battery: %s%% (Threshold: %s%%)"
+# Cycles of dashboard output kept in quiet mode and dumped when an alert fires
+FRAME_BUFFER_SIZE = 20
+
 # --- LOGGING SETUP ---
 logging.basicConfig(
     filename=LOG_FILE,
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
+# The format above never uses these, so skip collecting them per record
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+logger = logging.getLogger(__name__)
+
+# Telemetry log records are created as each cycle happens, held in one shared
+# buffer, and handed to the logging handlers in batches
+TELEMETRY_BUFFER_SIZE = 4096
+TELEMETRY_FLUSH_CYCLES = 50
+TELEMETRY = deque(maxlen=TELEMETRY_BUFFER_SIZE)
+
+# --- STATE ---
+@dataclass(slots=True)
+class VehicleState:
+    speed: float = 0
+    rpm: float = 0
+    battery: float = 100.0
+
+@dataclass(frozen=True, slots=True)
+class Thresholds:
+    speed: float
+    rpm: float
+    battery: float
+
+DEFAULT_THRESHOLDS = Thresholds(speed=110, rpm=6000, battery=10)
 
 def initialize_dashboard():
     print("--- Vehicle Dashboard Application Initialized ---")
-    data = {
-        "Speed_Km_hr": 0,
-        "RPM": 0,
-        "Battery_Level_Pct": 100.0
-    }
-    return data
+    return VehicleState()
+
+def _fallback_thresholds(message):
+    print(f"🚨 ERROR: {message}")
+    print("Using default hardcoded thresholds.")
+    return DEFAULT_THRESHOLDS
 
 def load_thresholds():
-    config = configparser.ConfigParser()
-    if not os.path.exists(CONFIG_FILE):
-        print(f"🚨 ERROR: Configuration file '{CONFIG_FILE}' not found!")
-        print("Using default hardcoded thresholds.")
-        return {
-            "Speed_Km_hr": 110,
-            "RPM": 6000,
-            "Battery_Level_Pct": 10
-        }
-
-    config.read(CONFIG_FILE)
+    # The file can vanish between stat() and open(), so both report a missing file the same way
     try:
-        thresholds = {
-            "Speed_Km_hr": config.getfloat('THRESHOLDS', 'SPEED_KM_HR'),
-            "RPM": config.getfloat('THRESHOLDS', 'RPM'),
-            "Battery_Level_Pct": config.getfloat('THRESHOLDS', 'BATTERY_LEVEL_PCT')
-        }
-        return thresholds
-    except configparser.Error as e:
-        print(f"🚨 ERROR reading config file: {e}")
-        print("Using default hardcoded thresholds.")
-        return {
-            "Speed_Km_hr": 110,
-            "RPM": 6000,
-            "Battery_Level_Pct": 10
-        }
-
-def get_real_time_data(current_data):
-    speed_change = random.randint(-15, 15)
-    new_speed = max(0, current_data["Speed_Km_hr"] + speed_change)
-    current_data["Speed_Km_hr"] = new_speed
-
-    new_rpm = max(800, min(6500, new_speed * 30 + random.randint(-400, 400)))
-    current_data["RPM"] = new_rpm
-
-    drain_factor = 0.01 + (current_data["RPM"] / 1500000)
-    new_battery = max(0.0, current_data["Battery_Level_Pct"] - drain_factor)
-    current_data["Battery_Level_Pct"] = round(new_battery, 2)
-
-    return current_data
-
-def display_dashboard(data):
-    print("\n-------------------------------------------")
-    print("      *** Real-Time Vehicle Status ***")
-    print("-------------------------------------------")
-    print(f"  🏎️  Speed: {data['Speed_Km_hr']: <4.0f} Km/hr")
-    rpm_bar = "█" * (int(data['RPM'] / 1000))
-    print(f"  ⚙️  RPM:   {data['RPM']: <4.0f} RPM ({rpm_bar})")
-
-    battery_level = int(data['Battery_Level_Pct'] / 10)
-    battery_icon = "🔋" if data['Battery_Level_Pct'] > 20 else "🪫"
-    battery_bar = "█" * battery_level + "░" * (10 - battery_level)
-    print(f"  {battery_icon} Battery: {data['Battery_Level_Pct']: <5.2f} % [{battery_bar}]")
-    print("-------------------------------------------")
-
-def check_alerts(data, thresholds):
-    alerts = []
+        key = (CONFIG_FILE, os.stat(CONFIG_FILE).st_mtime_ns)
+        if key in _THRESHOLD_CACHE:
+            return _THRESHOLD_CACHE[key]
+        with open(CONFIG_FILE) as f:
+            text = f.read()
+    except FileNotFoundError:
+        return _fallback_thresholds(f"Configuration file '{CONFIG_FILE}' not found!")
+    except (OSError, ValueError) as e:
+        return _fallback_thresholds(f"reading config file: {e}")
 
-    if data["Speed_Km_hr"] > thresholds["Speed_Km_hr"]:
-        alerts.append(f"🛑 HIGH SPEED ALERT! Speed: {data['Speed_Km_hr']} Km/hr (Threshold: {thresholds['Speed_Km_hr']})")
+    kv = dict(_KV.findall(text))
+    try:
+        thresholds = Thresholds(
+            speed=float(kv["SPEED_KM_HR"]),
+            rpm=float(kv["RPM"]),
+            battery=float(kv["BATTERY_LEVEL_PCT"])
+        )
+    except (KeyError, ValueError) as e:
+        return _fallback_thresholds(f"reading config file: missing or invalid {e}")
 
-    if data["RPM"] > thresholds["RPM"]:
-        alerts.append(f"⚠️ HIGH RPM ALERT! RPM: {data['RPM']} (Threshold: {thresholds['RPM']})")
+    _THRESHOLD_CACHE.clear()
+    _THRESHOLD_CACHE[key] = thresholds
+    return thresholds
 
-    if data["Battery_Level_Pct"] < thresholds["Battery_Level_Pct"]:
-        alerts.append(f"🪫 LOW BATTERY ALERT! Battery: {data['Battery_Level_Pct']}% (Threshold: {thresholds['Battery_Level_Pct']}%)")
+@njit(cache=True)
+def _step(speed, battery, speed_change, rpm_noise):
+    speed = speed + speed_change
+    speed = speed if speed > 0 else 0
 
-    if alerts:
-        print("\n*** SYSTEM ALERTS ***")
-        for alert in alerts:
-            print(alert)
-        print("*********************")
+    rpm = speed * 30 + rpm_noise
+    rpm = 800 if rpm < 800 else (6500 if rpm > 6500 else rpm)
+
+    battery = battery - (0.01 + rpm * _DRAIN_PER_RPM)
+    battery = round(battery, 2) if battery > 0 else 0.0
+    return speed, rpm, battery
+
+def get_real_time_data(state, speed_change=None, rpm_noise=None, randint=_rng.randint):
+    if speed_change is None:
+        speed_change = randint(-15, 15)
+    if rpm_noise is None:
+        rpm_noise = randint(-400, 400)
+
+    state.speed, state.rpm, state.battery = _step(state.speed, state.battery, speed_change, rpm_noise)
+    return state
+
+# --- FLEET ---
+# Fleet batteries are stored in hundredths of a percent (0-10000)
+BATTERY_SCALE = 100
+assert array("I").itemsize == 4 and array("H").itemsize == 2, "Fleet columns assume 32/16-bit C ints"
+# Slices a fleet is split into when ticked on an executor
+FLEET_WORKERS = os.cpu_count() or 1
+
+@njit(cache=True, nogil=True)
+def _indices_above(values, limit, start, stop):
+    return [i for i in range(start, stop) if values[i] > limit]
+
+@njit(cache=True, nogil=True)
+def _indices_below(values, limit, start, stop):
+    return [i for i in range(start, stop) if values[i] < limit]
+
+@njit(cache=True, nogil=True)
+def _tick_columns(speeds, rpms, batteries, speed_changes, rpm_noises, start, stop):
+    # Whole slice in one kernel call, so with numba the pass runs natively and
+    # threads working on different slices don't contend for the GIL
+    for i in range(start, stop):
+        speed, rpm, battery = _step(speeds[i], batteries[i] / BATTERY_SCALE, speed_changes[i], rpm_noises[i])
+        speeds[i] = speed
+        rpms[i] = rpm
+        batteries[i] = round(battery * BATTERY_SCALE)
+
+def _slices(n, executor, workers):
+    # Slices share the fleet's columns in memory, which a process pool would
+    # silently copy instead
+    if not isinstance(executor, ThreadPoolExecutor):
+        raise TypeError(f"Fleet needs a ThreadPoolExecutor, got {type(executor).__name__}")
+    if workers < 1:
+        raise ValueError(f"workers must be at least 1, got {workers}")
+    size = -(-n // workers) or 1
+    return [(start, min(start + size, n)) for start in range(0, n, size)]
+
+class Fleet:
+    # Struct-of-arrays state for many vehicles: one contiguous integer column per field.
+    # Speed and RPM are whole numbers already; battery is scaled by BATTERY_SCALE.
+    # RPM (<= 6500) and battery (<= 10000) fit in 16 bits ("H"). Speed is an
+    # unclamped random walk, so it gets a 32-bit column ("I", not "L", which is
+    # 64-bit on LP64 platforms such as Linux x86-64).
+    __slots__ = ("speeds", "rpms", "batteries")
+
+    def __init__(self, n_vehicles):
+        self.speeds = array("I", [0]) * n_vehicles
+        self.rpms = array("H", [0]) * n_vehicles
+        self.batteries = array("H", [100 * BATTERY_SCALE]) * n_vehicles
+
+    def __len__(self):
+        return len(self.speeds)
+
+    def battery_pct(self, i):
+        return self.batteries[i] / BATTERY_SCALE
 
+    def tick(self, rng=_rng, executor=None, workers=FLEET_WORKERS):
+        # Noise is drawn up front on the calling thread so a seeded rng gives the
+        # same fleet whether or not the update itself runs in parallel
+        n = len(self.speeds)
+        speed_changes = array("b", rng.choices(range(-15, 16), k=n))
+        rpm_noises = array("h", rng.choices(range(-400, 401), k=n))
+
+        if executor is None:
+            self._tick_range(0, n, speed_changes, rpm_noises)
+            return
+        futures = [
+            executor.submit(self._tick_range, start, stop, speed_changes, rpm_noises)
+            for start, stop in _slices(n, executor, workers)
+        ]
+        for future in futures:
+            future.result()
+
+    def _tick_range(self, start, stop, speed_changes, rpm_noises):
+        _tick_columns(self.speeds, self.rpms, self.batteries, speed_changes, rpm_noises, start, stop)
+
+    def check_alerts(self, thresholds, executor=None, workers=FLEET_WORKERS):
+        # Indices of the vehicles over speed, over RPM and under battery.
+        # Thresholds are rounded onto the integer grid once so each compare is int vs int.
+        limits = (
+            math.floor(thresholds.speed),
+            math.floor(thresholds.rpm),
+            # Round off float error first: 1.1 * 100 is 110.00000000000001, not 110
+            math.ceil(round(thresholds.battery * BATTERY_SCALE, 6))
+        )
+        n = len(self.speeds)
+        if executor is None:
+            return self._check_range(0, n, *limits)
+
+        # Each slice returns its own lists; merging them in slice order keeps indices sorted
+        futures = [executor.submit(self._check_range, start, stop, *limits) for start, stop in _slices(n, executor, workers)]
+        speeding, over_rpm, low_battery = [], [], []
+        for future in futures:
+            s, r, b = future.result()
+            speeding.extend(s)
+            over_rpm.extend(r)
+            low_battery.extend(b)
+        return speeding, over_rpm, low_battery
+
+    def _check_range(self, start, stop, max_speed, max_rpm, min_battery):
+        return (
+            _indices_above(self.speeds, max_speed, start, stop),
+            _indices_above(self.rpms, max_rpm, start, stop),
+            _indices_below(self.batteries, min_battery, start, stop)
+        )
+
+def _emit(text):
+    # Anything print() left in sys.stdout's buffer has to go out first to keep ordering
+    sys.stdout.flush()
+    data = text.encode(_ENC)
+    while data:
+        data = data[os.write(_STDOUT_FD, data):]
+
+@lru_cache(maxsize=256)
+def _render(speed, rpm, battery_centi):
+    # Arguments are the readings as displayed: whole Km/hr, whole RPM and battery
+    # in hundredths of a percent, so idle cycles hit the cache
+    battery_icon = "🔋" if battery_centi > 2000 else "🪫"
+    return (
+        "\n-------------------------------------------\n"
+        "      *** Real-Time Vehicle Status ***\n"
+        "-------------------------------------------\n"
+        f"  🏎️  Speed: {speed: <4.0f} Km/hr\n"
+        f"  ⚙️  RPM:   {rpm: <4.0f} RPM ({_RPM_BARS[rpm // 1000]})\n"
+        f"  {battery_icon} Battery: {battery_centi / 100: <5.2f} % [{_BATTERY_BARS[battery_centi // 1000]}]\n"
+        "-------------------------------------------\n"
+    )
+
+def display_dashboard(state, frame_buf=None, header=""):
+    frame = header + _render(round(state.speed), round(state.rpm), round(state.battery * 100))
+    if frame_buf is None:
+        _emit(frame)
+    else:
+        frame_buf.append(frame)
+
+# Source for a check_alerts_fast() specialised to one set of thresholds; the values
+# are baked in as literals so each compare is against a constant
+_ALERT_CHECKER_SRC = """
+def check_alerts_fast(state, alerts):
+    speed, rpm, battery = state.speed, state.rpm, state.battery
+    if speed > {speed!r}:
+        alerts.append(_FMT_SPEED % (speed, {speed!r}))
+    if rpm > {rpm!r}:
+        alerts.append(_FMT_RPM % (rpm, {rpm!r}))
+    if battery < {battery!r}:
+        alerts.append(_FMT_BATT % (battery, {battery!r}))
+"""
+
+@lru_cache(maxsize=32)
+def _alert_checker(thresholds, value_types):
+    # value_types is part of the key so 110 and 110.0, which hash equal, each keep
+    # their own literal and therefore their own message text
+    src = _ALERT_CHECKER_SRC.format(speed=thresholds.speed, rpm=thresholds.rpm, battery=thresholds.battery)
+    # repr() of a non-finite float is a bare name, so those need binding too
+    namespace = {"_FMT_SPEED": _FMT_SPEED, "_FMT_RPM": _FMT_RPM, "_FMT_BATT": _FMT_BATT, "inf": math.inf, "nan": math.nan}
+    exec(src, namespace)
+    return namespace["check_alerts_fast"]
+
+def make_alert_checker(thresholds):
+    return _alert_checker(thresholds, (type(thresholds.speed), type(thresholds.rpm), type(thresholds.battery)))
+
+def check_alerts(state, thresholds, frame_buf=None):
+    alerts = []
+    make_alert_checker(thresholds)(state, alerts)
+    _report_alerts(alerts, frame_buf)
     return alerts
 
-def log_data(data, alerts):
-    logging.info(f"Speed: {data['Speed_Km_hr']} Km/hr, RPM: {data['RPM']}, Battery: {data['Battery_Level_Pct']}%")
-    for alert in alerts:
-        logging.warning(alert)
+def _report_alerts(alerts, frame_buf=None):
+    if alerts:
+        banner = "\n*** SYSTEM ALERTS ***\n" + "\n".join(alerts) + "\n*********************\n"
+        if frame_buf:
+            banner = "".join(frame_buf) + banner
+            frame_buf.clear()
+        _emit(banner)
+
+def _telemetry_record(level, msg, args=()):
+    return logger.makeRecord(logger.name, level, "(unknown file)", 0, msg, args, None)
+
+def log_data(state, alerts):
+    if logger.isEnabledFor(logging.INFO):
+        TELEMETRY.append(_telemetry_record(
+            logging.INFO, "Speed: %s Km/hr, RPM: %s, Battery: %s%%", (state.speed, state.rpm, state.battery)
+        ))
+    if alerts and logger.isEnabledFor(logging.WARNING):
+        # One record per cycle for all of its alerts, one line per alert
+        TELEMETRY.append(_telemetry_record(logging.WARNING, "\n".join(alerts)))
+
+def flush_telemetry():
+    # logger.handle() applies the logger's filters and each handler's level and formatter
+    while TELEMETRY:
+        logger.handle(TELEMETRY.popleft())
+
+def _is_repeat(reading, previous):
+    # Readings are (whole Km/hr, whole RPM, battery in hundredths of a percent)
+    return (
+        previous is not None
+        and reading[0] == previous[0]
+        and reading[1] == previous[1]
+        and abs(reading[2] - previous[2]) <= REPEAT_BATTERY_TOLERANCE
+    )
+
+def next_interval(state, thresholds, interval):
+    # Smallest distance to any threshold, as a fraction of that threshold
+    margin = min(
+        (thresholds.speed - state.speed) / (thresholds.speed or 1),
+        (thresholds.rpm - state.rpm) / (thresholds.rpm or 1),
+        (state.battery - thresholds.battery) / (thresholds.battery or 1)
+    )
+    if margin < NEAR_MARGIN:
+        return FAST_POLL_INTERVAL
+    if margin > IDLE_MARGIN:
+        return IDLE_POLL_INTERVAL
+    return interval
 
-def run_monitoring_cycle(target_cycles=10):
+def run_monitoring_cycle(target_cycles=10, offline=False, seed=None, verbose=True):
     vehicle_data = initialize_dashboard()
+    rng = random.Random(seed)
+    randint = rng.randint
     thresholds = load_thresholds()
 
     print("\n--- Starting Monitoring Cycle ---")
-    print(f"Alert Thresholds: Speed > {thresholds['Speed_Km_hr']} Km/hr, RPM > {thresholds['RPM']}, Battery < {thresholds['Battery_Level_Pct']}%")
-
-    vehicle_data["Speed_Km_hr"] = 120
-    print(f"(Initial speed manually set to {vehicle_data['Speed_Km_hr']} Km/hr for immediate check)")
-
-    for cycle in range(1, target_cycles + 1):
-        print(f"\n======== CYCLE {cycle}/{target_cycles} ========")
-        vehicle_data = get_real_time_data(vehicle_data)
-        display_dashboard(vehicle_data)
-        alerts = check_alerts(vehicle_data, thresholds)
-        log_data(vehicle_data, alerts)
-        time.sleep(0.5)
+    print(f"Alert Thresholds: Speed > {thresholds.speed} Km/hr, RPM > {thresholds.rpm}, Battery < {thresholds.battery}%")
+
+    vehicle_data.speed = 120
+    print(f"(Initial speed manually set to {vehicle_data.speed} Km/hr for immediate check)")
+
+    interval = POLL_INTERVAL
+    deadline = time.monotonic()
+    # Quiet mode only shows the dashboard leading up to an alert
+    frame_buf = None if verbose else deque(maxlen=FRAME_BUFFER_SIZE)
+    checker = make_alert_checker(thresholds)
+    previous_reading = None
+    last_alerts = None
+    last_reported = 0
+
+    # Flush on the way out even if the run is interrupted, so buffered telemetry isn't lost
+    try:
+        for cycle in range(1, target_cycles + 1):
+            vehicle_data = get_real_time_data(vehicle_data, randint=randint)
+
+            # Alerts are checked every cycle so a threshold crossing is never skipped
+            alerts = []
+            checker(vehicle_data, alerts)
+            reading = (round(vehicle_data.speed), round(vehicle_data.rpm), round(vehicle_data.battery * 100))
+            repeat = (
+                _is_repeat(reading, previous_reading)
+                and alerts == last_alerts
+                and cycle - last_reported < HEARTBEAT_CYCLES
+            )
+            previous_reading = reading
+            if not repeat:
+                display_dashboard(vehicle_data, frame_buf, f"\n======== CYCLE {cycle}/{target_cycles} ========\n")
+                _report_alerts(alerts, frame_buf)
+                log_data(vehicle_data, alerts)
+                last_alerts = alerts
+                last_reported = cycle
+
+            if cycle % TELEMETRY_FLUSH_CYCLES == 0:
+                flush_telemetry()
+            # Offline (backtest) runs step straight through without waiting between cycles
+            if not offline:
+                interval = next_interval(vehicle_data, thresholds, interval)
+                deadline += interval
+                time.sleep(max(0, deadline - time.monotonic()))
+    finally:
+        flush_telemetry()
 
     print("\n--- Monitoring Cycle Complete ---")
 